@@ -4,10 +4,14 @@
 所有計算在此完成，前端只讀取預計算結果。
 """
 
+import heapq
 import logging
 import re
+import sys
+from bisect import bisect_left
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from operator import itemgetter
+from typing import Iterable, NamedTuple, Optional
 
 from collect_jira import IssueMetrics
 
@@ -20,11 +24,66 @@ EXCLUDED_FROM_TOTAL = {"backlog", "done", "unmapped"}
 DONE_PHASES = {"done"}
 
 
-def compute_percentile_stats(values: list[float]) -> dict:
+# compute_percentile_stats / _compute_hour_stats 輸出的百分位（0-1）
+PERCENTILES = (0.5, 0.75, 0.9)
+
+
+def _percentiles(values: list[float], presorted: bool = False) -> tuple[float, float, float]:
+    """計算 p50/p75/p90（線性插值），單位與輸入相同。
+
+    compute_percentile_stats 與 _compute_hour_stats 共用此核心，
+    只排序一次即取出三個百分位。呼叫方需確保 values 非空；
+    presorted=True 表示 values 已遞增排序，可跳過排序。
+    """
+    n = len(values)
+    # 小樣本（單一 project 的單一 phase 常只有 1-2 筆）直接套公式，省去排序與迴圈
+    if n == 1:
+        v = values[0]
+        return (v, v, v)
+    if n == 2:
+        a, b = values
+        if b < a:
+            a, b = b, a
+        d = b - a
+        return (a + 0.5 * d, a + 0.75 * d, a + 0.9 * d)
+
+    sorted_values = values if presorted else sorted(values)
+    last = n - 1
+    result = []
+    for p in PERCENTILES:
+        index = p * last
+        lower = int(index)
+        if lower >= last:
+            result.append(sorted_values[last])
+            continue
+        fraction = index - lower
+        low_value = sorted_values[lower]
+        result.append(low_value + fraction * (sorted_values[lower + 1] - low_value))
+    return (result[0], result[1], result[2])
+
+
+def _weekly_bins(timestamps: Iterable[datetime], now: datetime, num_weeks: int) -> list[int]:
+    """將時間點依「距 now 幾週」分桶計數。
+
+    Returns:
+        從最舊到最新排列的各週數量，長度為 num_weeks；超出範圍的時間點不計入
+    """
+    week_counts = [0] * num_weeks
+    last = num_weeks - 1
+    for ts in timestamps:
+        week_index = (now - ts).days // 7
+        if 0 <= week_index < num_weeks:
+            # week_index 0 = 最近一週，放在列表末尾
+            week_counts[last - week_index] += 1
+    return week_counts
+
+
+def compute_percentile_stats(values: list[float], presorted: bool = False) -> dict:
     """計算百分位統計數據。
 
     Args:
         values: 時間值列表（小時）
+        presorted: values 是否已遞增排序（可省去一次排序）
 
     Returns:
         {"p50": float, "p75": float, "p90": float, "count": int}  # 輸出單位：天
@@ -33,31 +92,14 @@ def compute_percentile_stats(values: list[float]) -> dict:
     if not values:
         return {"p50": 0.0, "p75": 0.0, "p90": 0.0, "count": 0}
 
-    sorted_values = sorted(values)
-    n = len(sorted_values)
-
-    def percentile(p: float) -> float:
-        """計算第 p 百分位（0-100）。"""
-        if n == 1:
-            return sorted_values[0]
-        index = (p / 100) * (n - 1)
-        lower = int(index)
-        upper = lower + 1
-        if upper >= n:
-            return sorted_values[lower]
-        fraction = index - lower
-        return sorted_values[lower] + fraction * (sorted_values[upper] - sorted_values[lower])
-
-    p50_hours = percentile(50)
-    p75_hours = percentile(75)
-    p90_hours = percentile(90)
+    p50_hours, p75_hours, p90_hours = _percentiles(values, presorted)
 
     # 轉換為天
     return {
         "p50": round(p50_hours / 24, 2),
         "p75": round(p75_hours / 24, 2),
         "p90": round(p90_hours / 24, 2),
-        "count": n,
+        "count": len(values),
     }
 
 
@@ -74,48 +116,51 @@ def group_by_team_project(
     Returns:
         {team_id: {project_key: [IssueMetrics]}}
     """
-    # 建立 project_key → team_id 的反向查找
-    project_to_team: dict[str, str] = {}
-    for team in config.get("teams", []):
-        team_id = team["id"]
-        for project_key in team.get("jira_projects", []):
-            project_to_team[project_key] = team_id
-
+    # 建立 project_key → 該 project 列表的反向查找，同時初始化所有 team/project 的空列表
+    # 直接對應到列表物件，分配時每筆 issue 只需一次 dict 查找，不必再經 result[team][project]
+    # key 以 sys.intern 與 issue.project（ingress 時已 intern）共用同一物件，查找走 identity 比對
+    project_buckets: dict[str, list[IssueMetrics]] = {}
     result: dict[str, dict[str, list[IssueMetrics]]] = {}
-
-    # 初始化所有 team/project 的空列表
     for team in config.get("teams", []):
-        team_id = team["id"]
-        result[team_id] = {}
+        team_projects = result.setdefault(team["id"], {})
         for project_key in team.get("jira_projects", []):
-            result[team_id][project_key] = []
+            project_key = sys.intern(project_key)
+            project_buckets[project_key] = team_projects.setdefault(project_key, [])
 
-    # 分配 issues
+    # 單次走訪分配 issues；未對應的 project 彙總後每個只警告一次
+    unknown_projects: dict[str, int] = {}
     for issue in issues:
-        team_id = project_to_team.get(issue.project)
-        if team_id and team_id in result:
-            if issue.project in result[team_id]:
-                result[team_id][issue.project].append(issue)
-            else:
-                result[team_id][issue.project] = [issue]
-        else:
-            logger.warning("issue %s 的 project %s 未對應到任何 team", issue.key, issue.project)
+        bucket = project_buckets.get(issue.project)
+        if bucket is None:
+            unknown_projects[issue.project] = unknown_projects.get(issue.project, 0) + 1
+            continue
+        bucket.append(issue)
+
+    for project_key, count in unknown_projects.items():
+        logger.warning("project %s 未對應到任何 team，略過 %d 筆 issue", project_key, count)
 
     return result
 
 
-def compute_throughput(issues: list[IssueMetrics], recent_days: int, num_weeks: int = 4) -> dict:
+def compute_throughput(
+    issues: list[IssueMetrics],
+    recent_days: int,
+    num_weeks: int = 4,
+    now: Optional[datetime] = None,
+) -> dict:
     """計算吞吐量統計。
 
     Args:
         issues: issue 列表
         recent_days: 計算最近幾天的完成數
         num_weeks: 週趨勢計算週數
+        now: 計算基準時間；None 時取當下時間（aggregate 會傳入同一個 now）
 
     Returns:
         {"completed_issues": int, "story_points": null, "weekly_trend": [int, ...]}
     """
-    now = datetime.now(timezone.utc)
+    if now is None:
+        now = datetime.now(timezone.utc)
     cutoff = now - timedelta(days=recent_days)
 
     resolved_issues = [
@@ -123,7 +168,7 @@ def compute_throughput(issues: list[IssueMetrics], recent_days: int, num_weeks:
         if issue.resolved is not None and issue.resolved >= cutoff
     ]
 
-    weekly_trend = compute_weekly_trend(issues, num_weeks=num_weeks)
+    weekly_trend = compute_weekly_trend(issues, num_weeks=num_weeks, now=now)
 
     return {
         "completed_issues": len(resolved_issues),
@@ -132,31 +177,25 @@ def compute_throughput(issues: list[IssueMetrics], recent_days: int, num_weeks:
     }
 
 
-def compute_weekly_trend(issues: list[IssueMetrics], num_weeks: int = 4) -> list[int]:
+def compute_weekly_trend(
+    issues: list[IssueMetrics],
+    num_weeks: int = 4,
+    now: Optional[datetime] = None,
+) -> list[int]:
     """計算最近 N 週各週的完成數。
 
     Args:
         issues: issue 列表
         num_weeks: 計算週數
+        now: 計算基準時間；None 時取當下時間
 
     Returns:
         從最舊到最新排列的各週完成數，長度為 num_weeks
     """
-    now = datetime.now(timezone.utc)
-    # 計算各週的起始時間（從最近一週往前推）
-    week_counts = [0] * num_weeks
-
-    for issue in issues:
-        if issue.resolved is None:
-            continue
-        delta_days = (now - issue.resolved).days
-        week_index = delta_days // 7
-        if 0 <= week_index < num_weeks:
-            # week_index 0 = 最近一週，放在列表末尾
-            list_index = num_weeks - 1 - week_index
-            week_counts[list_index] += 1
-
-    return week_counts
+    if now is None:
+        now = datetime.now(timezone.utc)
+    resolved_times = [issue.resolved for issue in issues if issue.resolved is not None]
+    return _weekly_bins(resolved_times, now, num_weeks)
 
 
 def _compute_iso_week_label(now: datetime, weeks_ago: int) -> str:
@@ -166,10 +205,50 @@ def _compute_iso_week_label(now: datetime, weeks_ago: int) -> str:
     return f"{iso_year}-W{iso_week:02d}"
 
 
+def _phase_columns(issues: list[IssueMetrics], phase_ids: Iterable[str]) -> dict[str, list[float]]:
+    """單次走訪 issues，將各 phase 大於 0 的停留時間收集為欄位列表。
+
+    每個 issue 的 phase_durations 只讀一次，同一次走訪順便累加 total
+    （排除 EXCLUDED_FROM_TOTAL），取代「每個 phase 與 total 各掃一遍所有 issue」。
+
+    Returns:
+        {phase_id: [hours, ...], "total": [hours, ...]}
+        phase_ids 中每個 phase 都有對應列表（可能為空）；total 只含大於 0 的值
+    """
+    columns: dict[str, list[float]] = {pid: [] for pid in phase_ids}
+    totals: list[float] = []
+    for issue in issues:
+        total_hours = 0.0
+        for phase_id, hours in issue.phase_durations.items():
+            if hours > 0:
+                if (column := columns.get(phase_id)) is not None:
+                    column.append(hours)
+                if phase_id not in EXCLUDED_FROM_TOTAL:
+                    total_hours += hours
+        if total_hours > 0:
+            totals.append(total_hours)
+    columns["total"] = totals
+    return columns
+
+
+def _concat_columns(
+    column_maps: Iterable[dict[str, list[float]]],
+    phase_ids: Iterable[str],
+) -> dict[str, list[float]]:
+    """將多個 project 的 phase 欄位（含 total）串接為 team 層級欄位，不需重新走訪 issues。"""
+    merged: dict[str, list[float]] = {pid: [] for pid in phase_ids}
+    merged["total"] = []
+    for columns in column_maps:
+        for phase_id, values in columns.items():
+            merged[phase_id].extend(values)
+    return merged
+
+
 def _compute_cycle_time_for_project(
     issues: list[IssueMetrics],
     phases: list[dict],
     filter_threshold_hours: float = 1.0,
+    columns: Optional[dict[str, list[float]]] = None,
 ) -> dict:
     """計算單一專案的週期時間統計。
 
@@ -180,48 +259,39 @@ def _compute_cycle_time_for_project(
         issues: IssueMetrics 列表
         phases: config phases 列表
         filter_threshold_hours: 過濾各 phase 的門檻（小時），預設 1 小時
+        columns: 已由 _phase_columns 取出的 resolved issues 欄位（如 team 層級由各 project
+                 欄位串接而成）；None 時從 issues 重新取出。各列表會被原地排序
 
     Returns:
         {phase_id: {"p50": float, "p75": float, "p90": float, "count": int}, ..., "total": {...}}
         active phase 額外包含 "filtered": {"p50", ..., "excluded_count", "threshold_hours"}
     """
-    # 只計算已解決的 issue
-    resolved_issues = [issue for issue in issues if issue.resolved is not None]
-
     phase_ids = [p["id"] for p in phases]
+    if columns is None:
+        # 只計算已解決的 issue；呼叫端已提供欄位時不需再篩一次
+        resolved_issues = [issue for issue in issues if issue.resolved is not None]
+        columns = _phase_columns(resolved_issues, phase_ids)
     cycle_time: dict[str, dict] = {}
 
     for phase_id in phase_ids:
-        values = [
-            issue.phase_durations[phase_id]
-            for issue in resolved_issues
-            if phase_id in issue.phase_durations and issue.phase_durations[phase_id] > 0
-        ]
-        stat = compute_percentile_stats(values)
+        values = columns[phase_id]
+        values.sort()
+        stat = compute_percentile_stats(values, presorted=True)
 
         # 對所有 active phase 計算 filtered 版本（排除 pass-through issue）
         if values and phase_id not in EXCLUDED_FROM_TOTAL:
-            filtered_values = [v for v in values if v >= filter_threshold_hours]
+            # values 已排序，門檻以上的值即為連續尾段，不需重新篩選與排序
+            filtered_values = values[bisect_left(values, filter_threshold_hours):]
             if filtered_values:
-                filtered_stat = compute_percentile_stats(filtered_values)
+                filtered_stat = compute_percentile_stats(filtered_values, presorted=True)
                 filtered_stat["excluded_count"] = len(values) - len(filtered_values)
                 filtered_stat["threshold_hours"] = filter_threshold_hours
                 stat["filtered"] = filtered_stat
 
         cycle_time[phase_id] = stat
 
-    # 計算 total（排除 backlog、done、unmapped）
-    total_values: list[float] = []
-    for issue in resolved_issues:
-        total_hours = sum(
-            hours
-            for phase, hours in issue.phase_durations.items()
-            if phase not in EXCLUDED_FROM_TOTAL and hours > 0
-        )
-        if total_hours > 0:
-            total_values.append(total_hours)
-
-    cycle_time["total"] = compute_percentile_stats(total_values)
+    # total（排除 backlog、done、unmapped）已在 _phase_columns 同一次走訪中累加
+    cycle_time["total"] = compute_percentile_stats(columns["total"])
 
     return cycle_time
 
@@ -270,13 +340,18 @@ def _compute_pr_dev_hours(prs: list) -> float:
     if not prs:
         return 0.0
 
-    earliest_start = min(pr.created_at for pr in prs)
+    # 單次走訪同時取得最早 created / review / merged，避免對同一組 PR 重複掃描
+    earliest_start = earliest_review = earliest_merge = None
+    for pr in prs:
+        if earliest_start is None or pr.created_at < earliest_start:
+            earliest_start = pr.created_at
+        review = pr.first_review_at
+        if review is not None and (earliest_review is None or review < earliest_review):
+            earliest_review = review
+        if earliest_merge is None or pr.merged_at < earliest_merge:
+            earliest_merge = pr.merged_at
 
-    reviews = [pr.first_review_at for pr in prs if pr.first_review_at is not None]
-    if reviews:
-        endpoint = min(reviews)
-    else:
-        endpoint = min(pr.merged_at for pr in prs)  # type: ignore[arg-type]
+    endpoint = earliest_review if earliest_review is not None else earliest_merge
 
     hours = (endpoint - earliest_start).total_seconds() / 3600
     return max(hours, 0.0)
@@ -325,14 +400,16 @@ def _enhance_dev_durations_with_prs(
     Returns:
         被補充的 issue 數量
     """
-    enhanced_count = 0
-    for issue in issues:
-        if issue.resolved is None:
-            continue
-        related_prs = pr_index.get(issue.key.upper(), [])
-        if not related_prs:
-            continue
+    # 先篩出 resolved 且有關聯 PR 的 issue，其餘 issue 不進入計算迴圈
+    matched = [
+        (issue, related_prs)
+        for issue in issues
+        if issue.resolved is not None
+        and (related_prs := pr_index.get(issue.key.upper()))
+    ]
 
+    enhanced_count = 0
+    for issue, related_prs in matched:
         # 優先使用 first_commit → PR_created coding 時間
         effective_hours = _compute_pr_coding_hours(related_prs)
         if effective_hours <= 0:
@@ -364,25 +441,13 @@ def _compute_hour_stats(values: list[float]) -> dict:
     if not values:
         return {"p50": 0.0, "p75": 0.0, "p90": 0.0, "count": 0}
 
-    sorted_values = sorted(values)
-    n = len(sorted_values)
-
-    def percentile(p: float) -> float:
-        if n == 1:
-            return sorted_values[0]
-        index = (p / 100) * (n - 1)
-        lower = int(index)
-        upper = lower + 1
-        if upper >= n:
-            return sorted_values[lower]
-        fraction = index - lower
-        return sorted_values[lower] + fraction * (sorted_values[upper] - sorted_values[lower])
+    p50, p75, p90 = _percentiles(values)
 
     return {
-        "p50": round(percentile(50), 1),
-        "p75": round(percentile(75), 1),
-        "p90": round(percentile(90), 1),
-        "count": n,
+        "p50": round(p50, 1),
+        "p75": round(p75, 1),
+        "p90": round(p90, 1),
+        "count": len(values),
     }
 
 
@@ -423,28 +488,27 @@ def _compute_pr_metrics(prs: list, large_pr_threshold: int) -> Optional[dict]:
     Returns:
         PR 指標 dict，若 prs 為空則回傳 None
     """
-    merged = [pr for pr in prs if pr.merged_at is not None]
-    if not merged:
-        return None
-
-    pickup_hours = [
-        (pr.first_review_at - pr.created_at).total_seconds() / 3600
-        for pr in merged
-        if pr.first_review_at is not None
-    ]
-
-    merge_hours = [
-        (pr.merged_at - pr.created_at).total_seconds() / 3600
-        for pr in merged
-    ]
+    # 單次走訪同時取出 pickup / merge 時間與大型 PR 數（merge_hours 筆數即 merged PR 數）
+    pickup_hours: list[float] = []
+    merge_hours: list[float] = []
+    large_count = 0
+    for pr in prs:
+        if pr.merged_at is None:
+            continue
+        merge_hours.append((pr.merged_at - pr.created_at).total_seconds() / 3600)
+        if pr.first_review_at is not None:
+            pickup_hours.append((pr.first_review_at - pr.created_at).total_seconds() / 3600)
+        if pr.is_large:
+            large_count += 1
 
-    large_count = sum(1 for pr in merged if pr.is_large)
+    if not merge_hours:
+        return None
 
     return {
-        "total_prs_merged": len(merged),
+        "total_prs_merged": len(merge_hours),
         "pickup_hours": _compute_hour_stats(pickup_hours),
         "merge_time_hours": _compute_hour_stats(merge_hours),
-        "large_pr_pct": round(large_count / len(merged) * 100, 1),
+        "large_pr_pct": round(large_count / len(merge_hours) * 100, 1),
     }
 
 
@@ -478,26 +542,28 @@ def _group_builds_by_team(config: dict, builds: list) -> dict[str, list]:
     return result
 
 
-def _compute_build_weekly_trend(builds: list, num_weeks: int = 4) -> list[int]:
-    """計算最近 N 週各週的建置數（從最舊到最新）。"""
-    now = datetime.now(timezone.utc)
-    week_counts = [0] * num_weeks
-
-    for build in builds:
-        delta_days = (now - build.timestamp).days
-        week_index = delta_days // 7
-        if 0 <= week_index < num_weeks:
-            list_index = num_weeks - 1 - week_index
-            week_counts[list_index] += 1
-
-    return week_counts
+def _compute_build_weekly_trend(
+    builds: list,
+    num_weeks: int = 4,
+    now: Optional[datetime] = None,
+) -> list[int]:
+    """計算最近 N 週各週的建置數（從最舊到最新）。now 為 None 時取當下時間。"""
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return _weekly_bins((build.timestamp for build in builds), now, num_weeks)
 
 
-def _compute_build_metrics(builds: list, num_weeks: int = 4) -> Optional[dict]:
+def _compute_build_metrics(
+    builds: list,
+    num_weeks: int = 4,
+    now: Optional[datetime] = None,
+) -> Optional[dict]:
     """計算 Jenkins 建置指標摘要。
 
     Args:
         builds: BuildResult 列表
+        num_weeks: 週趨勢計算週數
+        now: 計算基準時間；None 時取當下時間（aggregate 會傳入同一個 now）
 
     Returns:
         建置指標 dict，若無完成的建置則回傳 None
@@ -512,7 +578,7 @@ def _compute_build_metrics(builds: list, num_weeks: int = 4) -> Optional[dict]:
     durations = [b.duration_ms / 60000 for b in completed if b.duration_ms > 0]
     avg_duration = round(sum(durations) / len(durations), 1) if durations else 0.0
 
-    weekly_trend = _compute_build_weekly_trend(builds, num_weeks=num_weeks)
+    weekly_trend = _compute_build_weekly_trend(builds, num_weeks=num_weeks, now=now)
 
     return {
         "success_rate": success_rate,
@@ -539,6 +605,8 @@ def _build_sa_sd_matcher(
 
     Returns:
         (issue_types_set, compiled_patterns)
+        所有 summary pattern 合併為單一 alternation regex，每個 summary 只需一次 search；
+        無 pattern 時為空列表
     """
     rules = config.get("sa_sd_rules", {})
     if not rules:
@@ -547,10 +615,29 @@ def _build_sa_sd_matcher(
     if team_id and rules.get("overrides", {}).get(team_id):
         source = rules["overrides"][team_id]
     types = set(source.get("issue_types", []))
-    patterns = [re.compile(p, re.IGNORECASE) for p in source.get("summary_patterns", [])]
+
+    raw_patterns = source.get("summary_patterns", [])
+    # 錨定（^）的 branch 放前面：只比對開頭，失敗成本最低
+    ordered = sorted(raw_patterns, key=lambda p: not p.startswith("^"))
+    patterns = _compile_alternation(ordered) if ordered else []
     return (types, patterns)
 
 
+def _compile_alternation(raw_patterns: list[str]) -> list[re.Pattern]:
+    """將多個 pattern 合併為單一 alternation regex（case-insensitive）。
+
+    含 capture group（合併後 backreference 編號會錯位）或合併後無法編譯
+    （如含 inline global flag）時，退回逐條編譯。
+    """
+    compiled = [re.compile(p, re.IGNORECASE) for p in raw_patterns]
+    if len(compiled) == 1 or any(c.groups for c in compiled):
+        return compiled
+    try:
+        return [re.compile("|".join(f"(?:{p})" for p in raw_patterns), re.IGNORECASE)]
+    except re.error:
+        return compiled
+
+
 def _is_sa_sd_issue(
     issue: IssueMetrics,
     issue_types: set[str],
@@ -574,20 +661,26 @@ def _merge_sa_sd_into_planning(
     cycle_time: dict,
     normal_issues: list[IssueMetrics],
     sa_sd_entries: list[tuple[float, Optional[datetime]]],
+    columns: Optional[dict[str, list[float]]] = None,
 ) -> None:
     """將 SA/SD 活躍小時數併入 cycle_time["planning"]（原地修改）。
 
     只在 sa_sd_entries 非空時才修改，避免不必要的重算。
+    columns 含 planning 欄位時直接沿用（即 resolved issues 中 planning > 0 的值），
+    不再重新走訪 normal_issues。
     """
     if not sa_sd_entries:
         return
-    planning_values = [
-        issue.phase_durations["planning"]
-        for issue in normal_issues
-        if issue.resolved is not None
-        and "planning" in issue.phase_durations
-        and issue.phase_durations["planning"] > 0
-    ]
+    if columns is not None and "planning" in columns:
+        planning_values = list(columns["planning"])
+    else:
+        planning_values = [
+            issue.phase_durations["planning"]
+            for issue in normal_issues
+            if issue.resolved is not None
+            and "planning" in issue.phase_durations
+            and issue.phase_durations["planning"] > 0
+        ]
     planning_values.extend(h for h, _ in sa_sd_entries)
     cycle_time["planning"] = compute_percentile_stats(planning_values)
 
@@ -649,45 +742,63 @@ def _compute_phase_insights(
     return insights
 
 
+class BottleneckIssue(NamedTuple):
+    """瓶頸 phase 停留最久的單筆 issue。
+
+    寫入 dashboard.json 時以 _asdict() 轉為 dict，欄位順序即 JSON key 順序。
+    """
+
+    key: str
+    summary: str
+    parent_key: Optional[str]       # 只有 parent 為 Epic 時才帶入
+    parent_summary: Optional[str]
+    phase_duration_days: float
+    url: str
+
+
 def _find_bottleneck_issues(
     issues: list[IssueMetrics],
     bottleneck_phase: str,
     jira_base_url: str,
-    limit: int = 10,
-) -> list[dict]:
+    limit: Optional[int] = 10,
+) -> list[BottleneckIssue]:
     """找出瓶頸 phase 停留最久的 top N issues。
 
     Args:
         issues: 該 team 的所有 IssueMetrics
         bottleneck_phase: 瓶頸 phase id
         jira_base_url: Jira Cloud base URL，用於組裝連結
-        limit: 回傳筆數上限
+        limit: 回傳筆數上限，None 表示回傳全部
 
     Returns:
-        排序後的 issue 列表（停留天數降序）
+        排序後的 BottleneckIssue 列表（停留天數降序）
     """
-    candidates = []
-    for issue in issues:
-        if issue.resolved is None:
-            continue
-        hours = issue.phase_durations.get(bottleneck_phase, 0.0)
-        if hours > 0:
-            candidates.append((hours, issue))
+    # 一次性篩出 resolved 且該 phase 有停留時間的 issue，迴圈內不再逐筆分支
+    candidates = [
+        (hours, issue)
+        for issue in issues
+        if issue.resolved is not None
+        and (hours := issue.phase_durations.get(bottleneck_phase, 0.0)) > 0
+    ]
 
-    candidates.sort(key=lambda x: x[0], reverse=True)
+    # 只取 top N（O(N log limit)），結果只為入選的 issue 建立
+    if limit is None:
+        top = sorted(candidates, key=itemgetter(0), reverse=True)
+    else:
+        top = heapq.nlargest(limit, candidates, key=itemgetter(0))
 
     browse_url = jira_base_url.rstrip("/") + "/browse/"
     result = []
-    for hours, issue in candidates[:limit]:
+    for hours, issue in top:
         is_epic = issue.parent_issue_type == "Epic"
-        result.append({
-            "key": issue.key,
-            "summary": issue.summary,
-            "parent_key": issue.parent_key if is_epic else None,
-            "parent_summary": issue.parent_summary if is_epic else None,
-            "phase_duration_days": round(hours / 24, 2),
-            "url": browse_url + issue.key,
-        })
+        result.append(BottleneckIssue(
+            key=issue.key,
+            summary=issue.summary,
+            parent_key=issue.parent_key if is_epic else None,
+            parent_summary=issue.parent_summary if is_epic else None,
+            phase_duration_days=round(hours / 24, 2),
+            url=browse_url + issue.key,
+        ))
 
     return result
 
@@ -703,6 +814,8 @@ def _compute_team_aggregated(
     jira_base_url: str,
     num_weeks: int,
     recent_days: int,
+    columns: Optional[dict[str, list[float]]] = None,
+    now: Optional[datetime] = None,
 ) -> dict:
     """計算 team 層級聚合指標（可用於全量或 windowed 計算）。
 
@@ -717,11 +830,15 @@ def _compute_team_aggregated(
         jira_base_url: Jira base URL，用於組裝 issue 連結
         num_weeks: 趨勢週數
         recent_days: 計算 throughput completed_issues 的天數範圍
+        columns: 由各 project 欄位串接的 phase 欄位（見 _concat_columns），None 時從 issues 取出
+        now: 計算基準時間；None 時取當下時間
 
     Returns:
         aggregated dict（不含 projects，由呼叫方自行加入）
     """
-    team_cycle_time = _compute_cycle_time_for_project(issues, phases, filter_threshold_hours)
+    team_cycle_time = _compute_cycle_time_for_project(
+        issues, phases, filter_threshold_hours, columns=columns,
+    )
 
     # 先偵測瓶頸（在 SA/SD 合併之前，避免 planning p50 被 SA/SD 數據虛高汙染）
     bottleneck_phase_id = None
@@ -736,16 +853,17 @@ def _compute_team_aggregated(
             bottleneck_phase_id = pid
 
     # 再合併 SA/SD → planning（不影響已偵測的 bottleneck）
-    _merge_sa_sd_into_planning(team_cycle_time, issues, sa_sd_entries)
-    team_throughput = compute_throughput(issues, recent_days, num_weeks=num_weeks)
+    _merge_sa_sd_into_planning(team_cycle_time, issues, sa_sd_entries, columns=columns)
+    team_throughput = compute_throughput(issues, recent_days, num_weeks=num_weeks, now=now)
     team_pr_metrics = _compute_pr_metrics(prs, large_pr_threshold)
-    team_build_metrics = _compute_build_metrics(builds, num_weeks=num_weeks)
+    team_build_metrics = _compute_build_metrics(builds, num_weeks=num_weeks, now=now)
 
     bottleneck_issues = []
     if bottleneck_phase_id and jira_base_url:
-        bottleneck_issues = _find_bottleneck_issues(
-            issues, bottleneck_phase_id, jira_base_url,
-        )
+        bottleneck_issues = [
+            item._asdict()
+            for item in _find_bottleneck_issues(issues, bottleneck_phase_id, jira_base_url)
+        ]
 
     phase_insights = _compute_phase_insights(issues, phases, team_cycle_time)
 
@@ -800,6 +918,7 @@ def aggregate(
         collection_config.get("dev_filter_threshold_hours", 1.0),
     )
     phases = config.get("phases", [])
+    phase_ids = tuple(p["id"] for p in phases)
     jira_base_url = config.get("jira", {}).get("base_url", "")
 
     large_pr_threshold = config.get("dashboard", {}).get("large_pr_threshold", 400)
@@ -810,6 +929,12 @@ def aggregate(
     # 分組 Jira issues
     grouped = group_by_team_project(config, jira_data)
 
+    # 每個 team 的 SA/SD 識別規則只編譯一次
+    team_matchers = {
+        team["id"]: _build_sa_sd_matcher(config, team["id"])
+        for team in config.get("teams", [])
+    }
+
     # 分組 GitHub PRs 和 Jenkins builds（若有）
     prs_by_team = _group_prs_by_team(config, github_data or [])
     builds_by_team = _group_builds_by_team(config, jenkins_data or [])
@@ -865,7 +990,7 @@ def aggregate(
         team_prs = prs_by_team.get(team_id, [])
         team_builds = builds_by_team.get(team_id, [])
 
-        sa_sd_types, sa_sd_pats = _build_sa_sd_matcher(config, team_id)
+        sa_sd_types, sa_sd_pats = team_matchers[team_id]
         has_sa_sd = bool(sa_sd_types or sa_sd_pats)
 
         projects_output: dict = {}
@@ -873,10 +998,13 @@ def aggregate(
         all_team_sa_sd_entries: list[tuple[float, Optional[datetime]]] = []
         project_normal_map: dict[str, list[IssueMetrics]] = {}
         project_sa_sd_map: dict[str, list[tuple[float, Optional[datetime]]]] = {}
+        project_columns_map: dict[str, dict[str, list[float]]] = {}
 
         for project_key, project_issues in team_projects.items():
             if has_sa_sd:
+                # SA/SD 分類與 resolved 篩選在同一次走訪中完成
                 normal_issues: list[IssueMetrics] = []
+                resolved_normal: list[IssueMetrics] = []
                 sa_sd_entries: list[tuple[float, Optional[datetime]]] = []
                 for issue in project_issues:
                     if _is_sa_sd_issue(issue, sa_sd_types, sa_sd_pats):
@@ -885,19 +1013,27 @@ def aggregate(
                             sa_sd_entries.append((h, issue.resolved))
                     else:
                         normal_issues.append(issue)
+                        if issue.resolved is not None:
+                            resolved_normal.append(issue)
                 all_team_sa_sd_entries.extend(sa_sd_entries)
                 all_team_issues.extend(normal_issues)
             else:
                 normal_issues = project_issues
+                resolved_normal = [i for i in project_issues if i.resolved is not None]
                 sa_sd_entries = []
                 all_team_issues.extend(project_issues)
 
             project_normal_map[project_key] = normal_issues
             project_sa_sd_map[project_key] = sa_sd_entries
 
-            cycle_time = _compute_cycle_time_for_project(normal_issues, phases, filter_threshold_hours)
-            _merge_sa_sd_into_planning(cycle_time, normal_issues, sa_sd_entries)
-            throughput = compute_throughput(normal_issues, recent_days, num_weeks=trend_weeks)
+            # project 欄位保留下來，team 層級直接串接，不必重新走訪 issues
+            columns = _phase_columns(resolved_normal, phase_ids)
+            project_columns_map[project_key] = columns
+            cycle_time = _compute_cycle_time_for_project(
+                normal_issues, phases, filter_threshold_hours, columns=columns,
+            )
+            _merge_sa_sd_into_planning(cycle_time, normal_issues, sa_sd_entries, columns=columns)
+            throughput = compute_throughput(normal_issues, recent_days, num_weeks=trend_weeks, now=now)
 
             projects_output[project_key] = {
                 "cycle_time": cycle_time,
@@ -910,6 +1046,8 @@ def aggregate(
             all_team_issues, all_team_sa_sd_entries, team_prs, team_builds,
             phases, filter_threshold_hours, large_pr_threshold,
             jira_base_url, num_weeks=trend_weeks, recent_days=recent_days,
+            columns=_concat_columns(project_columns_map.values(), phase_ids),
+            now=now,
         )
 
         # Windowed 聚合
@@ -920,19 +1058,26 @@ def aggregate(
             w_prs = [p for p in team_prs if p.merged_at and p.merged_at >= cutoff]
             w_builds = [b for b in team_builds if b.timestamp >= cutoff]
             w_sa_sd = _filter_sa_sd_by_window(all_team_sa_sd_entries, cutoff)
-            w_agg = _compute_team_aggregated(
-                w_issues, w_sa_sd, w_prs, w_builds,
-                phases, filter_threshold_hours, large_pr_threshold,
-                jira_base_url, num_weeks=w, recent_days=min(recent_days, w * 7),
-            )
-            # project-level windowed cycle_time
+            # project-level windowed cycle_time（先算，欄位供 team 層級串接）
             w_projects: dict = {}
+            w_columns_map: dict[str, dict[str, list[float]]] = {}
             for pk, p_normal in project_normal_map.items():
                 p_w_issues = [i for i in p_normal if i.resolved and i.resolved >= cutoff]
                 p_w_sa_sd = _filter_sa_sd_by_window(project_sa_sd_map[pk], cutoff)
-                p_ct = _compute_cycle_time_for_project(p_w_issues, phases, filter_threshold_hours)
-                _merge_sa_sd_into_planning(p_ct, p_w_issues, p_w_sa_sd)
+                p_w_columns = _phase_columns(p_w_issues, phase_ids)
+                w_columns_map[pk] = p_w_columns
+                p_ct = _compute_cycle_time_for_project(
+                    p_w_issues, phases, filter_threshold_hours, columns=p_w_columns,
+                )
+                _merge_sa_sd_into_planning(p_ct, p_w_issues, p_w_sa_sd, columns=p_w_columns)
                 w_projects[pk] = {"cycle_time": p_ct}
+            w_agg = _compute_team_aggregated(
+                w_issues, w_sa_sd, w_prs, w_builds,
+                phases, filter_threshold_hours, large_pr_threshold,
+                jira_base_url, num_weeks=w, recent_days=min(recent_days, w * 7),
+                columns=_concat_columns(w_columns_map.values(), phase_ids),
+                now=now,
+            )
             w_agg["projects"] = w_projects
             by_window[str(w)] = w_agg
 
@@ -943,9 +1088,11 @@ def aggregate(
             "by_window": by_window,
         }
 
-        # 趨勢資料
-        team_resolved_weekly = compute_weekly_trend(all_team_issues, num_weeks=trend_weeks)
-        team_cycle_p50_weekly = _compute_weekly_cycle_time_p50(all_team_issues, num_weeks=trend_weeks)
+        # 趨勢資料（throughput 週趨勢已在 team 聚合時以相同 issues/週數算過，直接沿用）
+        team_resolved_weekly = team_agg["throughput"]["weekly_trend"]
+        team_cycle_p50_weekly = _compute_weekly_cycle_time_p50(
+            all_team_issues, num_weeks=trend_weeks, now=now,
+        )
 
         # PR pickup trend：取 team pr_metrics 中的 p50（單一值，非週趨勢）
         _team_pr_metrics = team_agg.get("pr_metrics")
@@ -997,13 +1144,20 @@ def aggregate(
 def _compute_weekly_cycle_time_p50(
     issues: list[IssueMetrics],
     num_weeks: int = 4,
+    now: Optional[datetime] = None,
 ) -> list[Optional[float]]:
     """計算最近 N 週各週的 cycle time p50（天）。
 
+    Args:
+        issues: 該 team 的 normal IssueMetrics
+        num_weeks: 計算週數
+        now: 計算基準時間；None 時取當下時間（aggregate 會傳入同一個 now）
+
     Returns:
         從最舊到最新排列，若該週無資料則為 None
     """
-    now = datetime.now(timezone.utc)
+    if now is None:
+        now = datetime.now(timezone.utc)
     weekly_hours: list[list[float]] = [[] for _ in range(num_weeks)]
 
     for issue in issues:
@@ -14,12 +14,15 @@ import re
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# 預設 Jira issue key pattern（config 未設定 pr_issue_pattern 時使用），於 import 時編譯一次
+JIRA_KEY_RE = re.compile(r"([A-Z][A-Z0-9]+-\d+)", re.IGNORECASE)
 
-@dataclass
+
+@dataclass(slots=True)
 class PRMetrics:
     """單一 PR 的原始指標。"""
 
@@ -36,9 +39,15 @@ class PRMetrics:
     first_commit_authored_at: Optional[datetime] = None  # 最早 commit 的作者時間
 
 
-def _extract_jira_keys(text: str, pattern: str) -> list[str]:
-    """從文字中提取 Jira issue key（如 PROJ-123）。"""
-    return re.findall(pattern, text, re.IGNORECASE)
+def _extract_jira_keys(text: str, pattern: Union[str, re.Pattern]) -> list[str]:
+    """從文字中提取 Jira issue key（如 PROJ-123）。
+
+    pattern 可傳入字串（以 IGNORECASE 編譯）或已編譯的 re.Pattern；
+    批次處理多筆 PR 時應先編譯一次再傳入，省去每次呼叫的 pattern cache 查找。
+    """
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern, re.IGNORECASE)
+    return pattern.findall(text)
 
 
 def _get_first_review_time(pr, author_login: str) -> Optional[datetime]:
@@ -88,7 +97,8 @@ def collect_github_prs(config: dict, since_hours: Optional[int] = None) -> list[
     collection_config = config.get("collection", {})
     lookback_days = collection_config.get("lookback_days", 90)
     api_delay = collection_config.get("github_api_delay_seconds", 0.1)
-    jira_pattern = collection_config.get("pr_issue_pattern", r"([A-Z][A-Z0-9]+-\d+)")
+    raw_pattern = collection_config.get("pr_issue_pattern")
+    jira_pattern = re.compile(raw_pattern, re.IGNORECASE) if raw_pattern is not None else JIRA_KEY_RE
 
     large_pr_threshold = config.get("dashboard", {}).get("large_pr_threshold", 400)
     if since_hours is not None:
@@ -22,7 +22,7 @@ from requests.auth import HTTPBasicAuth
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class BuildResult:
     """單一 Jenkins 建置的原始資料。"""
 
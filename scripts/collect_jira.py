@@ -5,19 +5,26 @@
 """
 
 import logging
+import sys
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Optional
 
 import requests
+from dateutil import parser as dateutil_parser
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class IssueMetrics:
-    """單一 Jira issue 的效能指標。"""
+    """單一 Jira issue 的效能指標。
+
+    使用 slots：aggregate 會大量建立並走訪 issue，省去每個實例的 __dict__。
+    不設 frozen，因為 PR 取代 dev 時間時會就地更新 phase_durations 等欄位。
+    """
 
     key: str
     project: str
@@ -55,18 +62,21 @@ def build_status_lookup(config: dict, project_key: str) -> dict[str, str]:
     project_override = overrides.get(project_key, {})
 
     # 從 default 建立基礎 lookup，跳過被 override 取代的 phase
+    # status / phase 以 sys.intern 共用字串物件：phase 會成為每筆 issue phase_durations 的 key
     lookup: dict[str, str] = {}
     for phase, statuses in default_mapping.items():
         if phase in project_override:
             # 此 phase 將被 override 完全取代，不採用 default 的映射
             continue
+        phase = sys.intern(phase)
         for status in statuses:
-            lookup[status] = phase
+            lookup[sys.intern(status)] = phase
 
     # 套用 per-project override（完全取代對應 phase 的映射）
     for phase, statuses in project_override.items():
+        phase = sys.intern(phase)
         for status in statuses:
-            lookup[status] = phase
+            lookup[sys.intern(status)] = phase
 
     return lookup
 
@@ -91,7 +101,8 @@ def compute_phase_durations(
         {"planning": 12.5, "dev": 48.0, "unmapped": 2.0, ...}
         時間單位：小時，只含有停留時間的 phase
     """
-    sorted_changes = sorted(status_changes, key=lambda x: x[0])
+    # Jira changelog 通常已依時間排序，Timsort 對已排序輸入只需一次 O(N) 掃描
+    sorted_changes = sorted(status_changes, key=itemgetter(0))
     phase_durations: dict[str, float] = {}
 
     if not sorted_changes:
@@ -166,7 +177,6 @@ def parse_changelog(
 
 def parse_jira_datetime(dt_str: str) -> datetime:
     """解析 Jira 回傳的 datetime 字串為 timezone-aware datetime。"""
-    from dateutil import parser as dateutil_parser
     dt = dateutil_parser.parse(dt_str)
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
@@ -332,7 +342,7 @@ def _process_issue(issue: dict, project_key: str, status_lookup: dict[str, str],
     if fields.get("assignee"):
         assignee = fields["assignee"].get("displayName")
 
-    issue_type = fields.get("issuetype", {}).get("name", "Unknown")
+    issue_type = sys.intern(fields.get("issuetype", {}).get("name", "Unknown"))
     current_status = fields.get("status", {}).get("name", "Unknown")
 
     sprint_name = _get_sprint_name_from_field(fields.get("customfield_10020"))
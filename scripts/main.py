@@ -20,6 +20,7 @@ import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import orjson
 import yaml
 
 from aggregate import aggregate
@@ -72,10 +73,21 @@ def write_dashboard_json(data: dict, now: datetime) -> None:
 
 
 def _write_json(data: dict, path: Path) -> None:
-    """寫入格式化 JSON 檔案，確保以換行符結尾。"""
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
-        f.write("\n")
+    """寫入格式化 JSON 檔案（indent=2、保留非 ASCII），確保以換行符結尾。
+
+    以 orjson 序列化（issue cache 達數 MB）；datetime 等非原生型別經 default=str 轉字串。
+    浮點數以最短表示輸出（如 0.00001、1e16），NaN 寫為 null（NaN 並非合法 JSON，前端無法解析）。
+    """
+    payload = orjson.dumps(
+        data,
+        default=str,
+        option=(
+            orjson.OPT_INDENT_2
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_APPEND_NEWLINE
+        ),
+    )
+    path.write_bytes(payload)
 
 
 def _serialize_issue(issue: IssueMetrics) -> dict:
@@ -99,11 +111,15 @@ def _serialize_issue(issue: IssueMetrics) -> dict:
 
 
 def _deserialize_issue(d: dict) -> IssueMetrics:
-    """從 dict 還原 IssueMetrics。"""
+    """從 dict 還原 IssueMetrics。
+
+    project / issue_type 在數千筆 issue 間高度重複，以 sys.intern 共用同一字串物件，
+    聚合時的分組與比對可走 identity 快速路徑。
+    """
     return IssueMetrics(
         key=d["key"],
-        project=d["project"],
-        issue_type=d["issue_type"],
+        project=sys.intern(d["project"]),
+        issue_type=sys.intern(d["issue_type"]),
         created=datetime.fromisoformat(d["created"]),
         resolved=datetime.fromisoformat(d["resolved"]) if d["resolved"] else None,
         phase_durations=d["phase_durations"],
@@ -129,9 +145,7 @@ def load_issues_cache() -> dict[str, dict]:
 def save_issues_cache(cache: dict[str, dict]) -> None:
     """將 issue cache 寫入 data/cache/issues.json。"""
     CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with CACHE_PATH.open("w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2, default=str)
-        f.write("\n")
+    _write_json(cache, CACHE_PATH)
     logger.info("已寫入 cache: %s（%d 筆）", CACHE_PATH, len(cache))
 
 
@@ -181,9 +195,7 @@ def load_prs_cache() -> dict[str, dict]:
 def save_prs_cache(cache: dict[str, dict]) -> None:
     """將 PR cache 寫入 data/cache/prs.json。"""
     PR_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with PR_CACHE_PATH.open("w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2, default=str)
-        f.write("\n")
+    _write_json(cache, PR_CACHE_PATH)
     logger.info("已寫入 PR cache: %s（%d 筆）", PR_CACHE_PATH, len(cache))
 
 
@@ -240,13 +252,17 @@ def main() -> None:
     # ── 用最新 status mapping 重算 phase_durations ──────────────────────────
     remapped = 0
     unmapped_report: dict[str, set[str]] = {}  # status → set of project keys
+    # 同一 project 的 lookup 相同，每個 project 只建一次
+    lookups: dict[str, dict[str, str]] = {}
 
     for data in cache.values():
         transitions = data.get("status_transitions", [])
         if not transitions:
             continue
         project = data["project"]
-        lookup = build_status_lookup(config, project)
+        lookup = lookups.get(project)
+        if lookup is None:
+            lookup = lookups[project] = build_status_lookup(config, project)
         status_changes = [
             (parse_jira_datetime(t["timestamp"]), t["from_status"], t["to_status"])
             for t in transitions
@@ -19,11 +19,13 @@ from aggregate import (
     _compute_pr_dev_hours,
     _compute_sa_sd_planning_hours,
     _compute_team_aggregated,
+    _concat_columns,
     _enhance_dev_durations_with_prs,
     _filter_sa_sd_by_window,
     _find_bottleneck_issues,
     _is_sa_sd_issue,
     _merge_sa_sd_into_planning,
+    _phase_columns,
     aggregate,
     compute_percentile_stats,
     compute_throughput,
@@ -181,6 +183,20 @@ def test_group_by_team_project_unknown_project(caplog):
     assert "PROJ-X" in caplog.text
 
 
+def test_group_by_team_project_unknown_project_warns_once(caplog):
+    """同一未對應 project 的多筆 issue 只應產生一則警告。"""
+    import logging
+    issues = [make_issue(f"PROJ-X-{i}", "PROJ-X") for i in range(3)]
+
+    with caplog.at_level(logging.WARNING):
+        grouped = group_by_team_project(SAMPLE_CONFIG, issues)
+
+    warnings = [r for r in caplog.records if "PROJ-X" in r.getMessage()]
+    assert len(warnings) == 1
+    assert "3" in warnings[0].getMessage()
+    assert all(not issues for projects in grouped.values() for issues in projects.values())
+
+
 # ============================================================
 # compute_throughput 測試
 # ============================================================
@@ -211,6 +227,20 @@ def test_compute_throughput_no_resolved():
     assert throughput["completed_issues"] == 0
 
 
+def test_compute_throughput_explicit_now():
+    """傳入 now 時應以該時間為基準計算，結果與執行當下無關。"""
+    issues = [
+        make_issue("A-1", resolved=NOW - timedelta(days=2)),
+        make_issue("A-2", resolved=NOW - timedelta(days=9)),
+        make_issue("A-3", resolved=NOW - timedelta(days=40)),
+    ]
+
+    throughput = compute_throughput(issues, recent_days=30, num_weeks=2, now=NOW)
+
+    assert throughput["completed_issues"] == 2
+    assert throughput["weekly_trend"] == [1, 1]
+
+
 # ============================================================
 # compute_weekly_trend 測試
 # ============================================================
@@ -289,6 +319,28 @@ def test_aggregate_total_cycle_time():
     assert total_stats["count"] == 2
 
 
+def test_phase_columns_single_pass():
+    """_phase_columns 應依 phase 收集正值，略過 0 與不在 phase_ids 內的 phase；total 含所有 active phase。"""
+    issues = [
+        make_issue("A-1", phase_durations={"dev": 48.0, "qa": 0.0, "unknown": 5.0}),
+        make_issue("A-2", phase_durations={"dev": 24.0, "qa": 12.0}),
+    ]
+
+    columns = _phase_columns(issues, ["dev", "qa", "review"])
+
+    assert columns == {"dev": [48.0, 24.0], "qa": [12.0], "review": [], "total": [53.0, 36.0]}
+
+
+def test_concat_columns_merges_projects():
+    """_concat_columns 應將各 project 欄位依 phase 串接。"""
+    merged = _concat_columns(
+        [{"dev": [24.0], "qa": [], "total": [24.0]}, {"dev": [48.0], "qa": [12.0], "total": [60.0]}],
+        ["dev", "qa"],
+    )
+
+    assert merged == {"dev": [24.0, 48.0], "qa": [12.0], "total": [24.0, 60.0]}
+
+
 def test_aggregate_phase_only_nonzero():
     """沒有停留時間的 phase 不應計入 p50/p85（count 為 0）。"""
     resolved = datetime.now(timezone.utc) - timedelta(days=1)
@@ -416,12 +468,12 @@ def test_find_bottleneck_issues_sorted_desc():
     result = _find_bottleneck_issues(issues, "dev", JIRA_BASE)
 
     assert len(result) == 3
-    assert result[0]["key"] == "A-2"
-    assert result[1]["key"] == "A-3"
-    assert result[2]["key"] == "A-1"
-    assert result[0]["phase_duration_days"] == 3.0
-    assert result[1]["phase_duration_days"] == 2.0
-    assert result[2]["phase_duration_days"] == 1.0
+    assert result[0].key == "A-2"
+    assert result[1].key == "A-3"
+    assert result[2].key == "A-1"
+    assert result[0].phase_duration_days == 3.0
+    assert result[1].phase_duration_days == 2.0
+    assert result[2].phase_duration_days == 1.0
 
 
 def test_find_bottleneck_issues_limit():
@@ -435,8 +487,38 @@ def test_find_bottleneck_issues_limit():
     result = _find_bottleneck_issues(issues, "dev", JIRA_BASE, limit=2)
 
     assert len(result) == 2
-    assert result[0]["key"] == "A-5"
-    assert result[1]["key"] == "A-4"
+    assert result[0].key == "A-5"
+    assert result[1].key == "A-4"
+
+
+def test_find_bottleneck_issues_no_limit():
+    """limit=None 時應回傳全部有停留時間的 issue，並依降序排列。"""
+    resolved = datetime.now(timezone.utc) - timedelta(days=1)
+    issues = [
+        make_issue(f"A-{i}", resolved=resolved, phase_durations={"dev": float(i * 24)})
+        for i in range(1, 13)
+    ] + [make_issue("A-0", resolved=resolved, phase_durations={"dev": 0.0})]
+
+    result = _find_bottleneck_issues(issues, "dev", JIRA_BASE, limit=None)
+
+    assert len(result) == 12
+    assert result[0].key == "A-12"
+    assert result[-1].key == "A-1"
+
+
+def test_find_bottleneck_issues_ties_keep_input_order():
+    """停留時間相同時，應維持輸入順序（與穩定排序結果一致）。"""
+    resolved = datetime.now(timezone.utc) - timedelta(days=1)
+    issues = [
+        make_issue("A-1", resolved=resolved, phase_durations={"dev": 24.0}),
+        make_issue("A-2", resolved=resolved, phase_durations={"dev": 48.0}),
+        make_issue("A-3", resolved=resolved, phase_durations={"dev": 24.0}),
+        make_issue("A-4", resolved=resolved, phase_durations={"dev": 24.0}),
+    ]
+
+    result = _find_bottleneck_issues(issues, "dev", JIRA_BASE, limit=3)
+
+    assert [item.key for item in result] == ["A-2", "A-1", "A-3"]
 
 
 def test_find_bottleneck_issues_excludes_unresolved():
@@ -450,7 +532,7 @@ def test_find_bottleneck_issues_excludes_unresolved():
     result = _find_bottleneck_issues(issues, "dev", JIRA_BASE)
 
     assert len(result) == 1
-    assert result[0]["key"] == "A-1"
+    assert result[0].key == "A-1"
 
 
 def test_find_bottleneck_issues_empty():
@@ -478,10 +560,10 @@ def test_find_bottleneck_issues_url_and_parent():
 
     assert len(result) == 1
     item = result[0]
-    assert item["url"] == "https://example.atlassian.net/browse/PROJ-123"
-    assert item["summary"] == "Fix login bug"
-    assert item["parent_key"] == "PROJ-100"
-    assert item["parent_summary"] == "Auth Epic"
+    assert item.url == "https://example.atlassian.net/browse/PROJ-123"
+    assert item.summary == "Fix login bug"
+    assert item.parent_key == "PROJ-100"
+    assert item.parent_summary == "Auth Epic"
 
 
 def test_find_bottleneck_issues_non_epic_parent_excluded():
@@ -500,8 +582,8 @@ def test_find_bottleneck_issues_non_epic_parent_excluded():
 
     assert len(result) == 1
     item = result[0]
-    assert item["parent_key"] is None
-    assert item["parent_summary"] is None
+    assert item.parent_key is None
+    assert item.parent_summary is None
 
 
 def test_find_bottleneck_issues_no_parent():
@@ -513,8 +595,8 @@ def test_find_bottleneck_issues_no_parent():
 
     result = _find_bottleneck_issues(issues, "dev", JIRA_BASE)
 
-    assert result[0]["parent_key"] is None
-    assert result[0]["parent_summary"] is None
+    assert result[0].parent_key is None
+    assert result[0].parent_summary is None
 
 
 def test_aggregate_bottleneck_phase_identification():
@@ -636,6 +718,41 @@ def test_sa_sd_per_team_override():
     assert "SA/SD" in beta_types
 
 
+def test_build_sa_sd_matcher_combines_patterns():
+    """所有 summary pattern 應合併為單一 regex，匹配結果不變。"""
+    config = {
+        **SAMPLE_CONFIG,
+        "sa_sd_rules": {
+            "issue_types": [],
+            "summary_patterns": [r"^\[SA\]", r"^\[SD\]", r"(?<![A-Za-z])SA/?SD(?![A-Za-z])"],
+        },
+    }
+
+    types, patterns = _build_sa_sd_matcher(config, "team-alpha")
+
+    assert len(patterns) == 1
+    assert _is_sa_sd_issue(make_issue(summary="[sd] 架構設計"), types, patterns) is True
+    assert _is_sa_sd_issue(make_issue(summary="後端SA/SD"), types, patterns) is True
+    assert _is_sa_sd_issue(make_issue(summary="Fix [SA] label"), types, patterns) is False
+    assert _is_sa_sd_issue(make_issue(summary="NASASD mission"), types, patterns) is False
+
+
+def test_build_sa_sd_matcher_keeps_capture_group_patterns_separate():
+    """含 capture group 的 pattern 不合併，避免 backreference 編號錯位。"""
+    config = {
+        **SAMPLE_CONFIG,
+        "sa_sd_rules": {
+            "issue_types": [],
+            "summary_patterns": [r"^\[SA\]", r"(SD)-\1"],
+        },
+    }
+
+    types, patterns = _build_sa_sd_matcher(config, "team-alpha")
+
+    assert len(patterns) == 2
+    assert _is_sa_sd_issue(make_issue(summary="SD-SD review"), types, patterns) is True
+
+
 def test_sa_sd_merged_into_planning():
     """SA/SD 票的活躍時間應合併到 planning p50，dev count 不含 SA/SD 票。"""
     resolved = datetime.now(timezone.utc) - timedelta(days=1)
@@ -1338,6 +1455,22 @@ def test_merge_sa_sd_into_planning_with_tuples():
     assert abs(cycle_time["planning"]["p50"] - 2.0) < 0.01
 
 
+def test_merge_sa_sd_into_planning_reuses_columns():
+    """傳入 columns 時應沿用其 planning 欄位，且不修改原欄位列表。"""
+    resolved = datetime.now(timezone.utc) - timedelta(days=1)
+    normal = make_issue("PROJ-A-1", resolved=resolved, phase_durations={"planning": 24.0})
+    columns = _phase_columns([normal], ["planning"])
+    from_columns = {"planning": {}}
+    from_issues = {"planning": {}}
+    sa_sd_entries = [(48.0, resolved), (72.0, resolved)]
+
+    _merge_sa_sd_into_planning(from_columns, [normal], sa_sd_entries, columns=columns)
+    _merge_sa_sd_into_planning(from_issues, [normal], sa_sd_entries)
+
+    assert from_columns == from_issues
+    assert columns["planning"] == [24.0]
+
+
 def test_filter_sa_sd_by_window_basic():
     """_filter_sa_sd_by_window 應過濾掉 resolved < cutoff 的 entries。"""
     now = datetime.now(timezone.utc)
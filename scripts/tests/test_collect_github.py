@@ -6,13 +6,14 @@
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from collect_github import PRMetrics, _extract_jira_keys, _get_first_review_time
+from collect_github import JIRA_KEY_RE, PRMetrics, _extract_jira_keys, _get_first_review_time
 
 
 # ============================================================
@@ -45,27 +46,32 @@ def test_extract_jira_keys_body():
     assert "ALPHA-999" in keys
 
 
+def test_extract_jira_keys_compiled_pattern():
+    """傳入已編譯的 pattern 應與字串 pattern 結果相同（含大小寫不敏感）。"""
+    text = "proj-7: Fix PROJ-123"
+    assert _extract_jira_keys(text, JIRA_KEY_RE) == _extract_jira_keys(text, r"([A-Z][A-Z0-9]+-\d+)")
+    assert _extract_jira_keys(text, JIRA_KEY_RE) == ["proj-7", "PROJ-123"]
+
+
 # ============================================================
 # _get_first_review_time 測試
 # ============================================================
 
 
-def _make_review(login: str, submitted_at: datetime) -> MagicMock:
-    review = MagicMock()
-    review.user = MagicMock()
-    review.user.login = login
-    review.submitted_at = submitted_at
-    return review
+def _make_review(login: str, submitted_at: datetime) -> SimpleNamespace:
+    return SimpleNamespace(user=SimpleNamespace(login=login), submitted_at=submitted_at)
+
+
+def _make_github_pr(reviews: list[SimpleNamespace]) -> SimpleNamespace:
+    """只需 number 與 get_reviews() 的輕量 PR 替身（不需 MagicMock 的動態屬性）。"""
+    return SimpleNamespace(number=1, get_reviews=lambda: reviews)
 
 
 def test_get_first_review_time_returns_non_author_review():
     """應回傳第一個非作者的 review 時間。"""
     t1 = datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
     t2 = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
-    reviews = [_make_review("author", t1), _make_review("reviewer", t2)]
-    pr = MagicMock()
-    pr.number = 1
-    pr.get_reviews.return_value = reviews
+    pr = _make_github_pr([_make_review("author", t1), _make_review("reviewer", t2)])
 
     result = _get_first_review_time(pr, "author")
     assert result == t2
@@ -74,10 +80,7 @@ def test_get_first_review_time_returns_non_author_review():
 def test_get_first_review_time_no_non_author_review():
     """只有作者自己 review 時應回傳 None。"""
     t1 = datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
-    reviews = [_make_review("author", t1)]
-    pr = MagicMock()
-    pr.number = 1
-    pr.get_reviews.return_value = reviews
+    pr = _make_github_pr([_make_review("author", t1)])
 
     result = _get_first_review_time(pr, "author")
     assert result is None
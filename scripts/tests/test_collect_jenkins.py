@@ -149,6 +149,18 @@ def test_compute_build_weekly_trend():
     assert trend[0] == 1  # 第 1 週：1 筆
 
 
+def test_compute_build_weekly_trend_explicit_now():
+    """傳入 now 時應以其為基準分週，而非當下時間。"""
+    from aggregate import _compute_build_weekly_trend
+
+    builds = [_make_build("SUCCESS", 300000, days_ago=1)]
+    # 以 10 天後為基準：該 build 落在 11 天前，即倒數第 2 週
+    now = datetime.now(timezone.utc) + timedelta(days=10)
+    trend = _compute_build_weekly_trend(builds, num_weeks=4, now=now)
+
+    assert trend == [0, 0, 1, 0]
+
+
 def test_collect_jenkins_builds_disabled(monkeypatch):
     """jenkins.enabled = false 時應回傳空列表。"""
     from collect_jenkins import collect_jenkins_builds
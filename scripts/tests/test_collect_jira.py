@@ -5,9 +5,11 @@
 
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
+from dateutil import parser as dateutil_parser
 
 # 將 scripts/ 加入 path，使測試可以 import collect_jira
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -136,123 +138,114 @@ SIMPLE_LOOKUP = {
 }
 
 
-def test_parse_changelog_linear_path():
-    """正常線性流程：各 phase 時間應正確計算。"""
-    created = dt(2026, 1, 1, 9, 0)
-    now = dt(2026, 1, 10, 9, 0)
-
-    entries = [
-        make_changelog_entry("2026-01-01T10:00:00+00:00", "To Do", "Analysis"),
-        make_changelog_entry("2026-01-02T09:00:00+00:00", "Analysis", "In Progress"),
-        make_changelog_entry("2026-01-05T09:00:00+00:00", "In Progress", "In Review"),
-        make_changelog_entry("2026-01-06T09:00:00+00:00", "In Review", "QA Testing"),
-        make_changelog_entry("2026-01-08T09:00:00+00:00", "QA Testing", "Done"),
-    ]
-
-    durations = parse_changelog(entries, SIMPLE_LOOKUP, created, now)
-
-    # backlog: 9:00 → 10:00 = 1 小時
-    assert abs(durations.get("backlog", 0) - 1.0) < 0.01
-    # planning: 10:00 → 次日 9:00 = 23 小時
-    assert abs(durations.get("planning", 0) - 23.0) < 0.01
-    # dev: Jan 2 9:00 → Jan 5 9:00 = 72 小時
-    assert abs(durations.get("dev", 0) - 72.0) < 0.01
-    # review: Jan 5 9:00 → Jan 6 9:00 = 24 小時
-    assert abs(durations.get("review", 0) - 24.0) < 0.01
-    # qa: Jan 6 9:00 → Jan 8 9:00 = 48 小時
-    assert abs(durations.get("qa", 0) - 48.0) < 0.01
-    # done: Jan 8 9:00 → now (Jan 10 9:00) = 48 小時
-    assert abs(durations.get("done", 0) - 48.0) < 0.01
-
-
-def test_parse_changelog_backward_transition():
-    """回退（QA → Dev → QA）時各 phase 時間應累加，不重置。"""
-    created = dt(2026, 1, 1, 0, 0)
-    now = dt(2026, 1, 10, 0, 0)
-
-    entries = [
-        make_changelog_entry("2026-01-01T00:00:00+00:00", "To Do", "In Progress"),
-        make_changelog_entry("2026-01-02T00:00:00+00:00", "In Progress", "QA Testing"),
-        make_changelog_entry("2026-01-03T00:00:00+00:00", "QA Testing", "In Progress"),  # 回退
-        make_changelog_entry("2026-01-05T00:00:00+00:00", "In Progress", "QA Testing"),  # 再進 QA
-        make_changelog_entry("2026-01-08T00:00:00+00:00", "QA Testing", "Done"),
-    ]
-
-    durations = parse_changelog(entries, SIMPLE_LOOKUP, created, now)
-
-    # dev 第一次：1 天 = 24 小時，第二次：2 天 = 48 小時，合計 72 小時
-    assert abs(durations.get("dev", 0) - 72.0) < 0.01
-    # qa 第一次：1 天 = 24 小時，第二次：3 天 = 72 小時，合計 96 小時
-    assert abs(durations.get("qa", 0) - 96.0) < 0.01
-
-
-def test_parse_changelog_unmapped_status():
-    """未知狀態應計入 'unmapped' key，並記錄警告。"""
-    created = dt(2026, 1, 1, 0, 0)
-    now = dt(2026, 1, 5, 0, 0)
-
-    entries = [
-        make_changelog_entry("2026-01-01T00:00:00+00:00", "To Do", "UNKNOWN_STATUS"),
-        make_changelog_entry("2026-01-03T00:00:00+00:00", "UNKNOWN_STATUS", "In Progress"),
-    ]
-
-    durations = parse_changelog(entries, SIMPLE_LOOKUP, created, now)
-
-    # UNKNOWN_STATUS: 2 天 = 48 小時
-    assert "unmapped" in durations
-    assert abs(durations["unmapped"] - 48.0) < 0.01
-    # In Progress → now: 2 天 = 48 小時
-    assert abs(durations.get("dev", 0) - 48.0) < 0.01
-
+# 正常線性流程（parse_changelog 與 compute_phase_durations 共用同一組向量）
+LINEAR_PATH_CREATED = dt(2026, 1, 1, 9, 0)
+LINEAR_PATH_NOW = dt(2026, 1, 10, 9, 0)
+LINEAR_PATH_CHANGES = (
+    ("2026-01-01T10:00:00+00:00", "To Do", "Analysis"),
+    ("2026-01-02T09:00:00+00:00", "Analysis", "In Progress"),
+    ("2026-01-05T09:00:00+00:00", "In Progress", "In Review"),
+    ("2026-01-06T09:00:00+00:00", "In Review", "QA Testing"),
+    ("2026-01-08T09:00:00+00:00", "QA Testing", "Done"),
+)
+LINEAR_PATH_EXPECTED = {
+    "backlog": 1.0,    # 9:00 → 10:00
+    "planning": 23.0,  # 10:00 → 次日 9:00
+    "dev": 72.0,       # Jan 2 9:00 → Jan 5 9:00
+    "review": 24.0,    # Jan 5 9:00 → Jan 6 9:00
+    "qa": 48.0,        # Jan 6 9:00 → Jan 8 9:00
+    "done": 48.0,      # Jan 8 9:00 → now (Jan 10 9:00)
+}
 
-def test_parse_changelog_in_progress_issue():
-    """未解決的 issue 仍應計算已完成階段的時間。"""
-    created = dt(2026, 1, 1, 0, 0)
-    now = dt(2026, 1, 5, 0, 0)
+PARSE_CHANGELOG_CASES = [
+    # 正常線性流程：各 phase 時間應正確計算
+    pytest.param(
+        LINEAR_PATH_CREATED,
+        LINEAR_PATH_NOW,
+        [make_changelog_entry(*change) for change in LINEAR_PATH_CHANGES],
+        LINEAR_PATH_EXPECTED,
+        id="linear_path",
+    ),
+    # 回退（QA → Dev → QA）時各 phase 時間應累加，不重置
+    pytest.param(
+        dt(2026, 1, 1, 0, 0),
+        dt(2026, 1, 10, 0, 0),
+        [
+            make_changelog_entry("2026-01-01T00:00:00+00:00", "To Do", "In Progress"),
+            make_changelog_entry("2026-01-02T00:00:00+00:00", "In Progress", "QA Testing"),
+            make_changelog_entry("2026-01-03T00:00:00+00:00", "QA Testing", "In Progress"),  # 回退
+            make_changelog_entry("2026-01-05T00:00:00+00:00", "In Progress", "QA Testing"),  # 再進 QA
+            make_changelog_entry("2026-01-08T00:00:00+00:00", "QA Testing", "Done"),
+        ],
+        {
+            "dev": 72.0,   # 第一次 24 小時 + 第二次 48 小時
+            "qa": 96.0,    # 第一次 24 小時 + 第二次 72 小時
+            "done": 48.0,  # Jan 8 → now (Jan 10)
+        },
+        id="backward_transition",
+    ),
+    # 未知狀態應計入 'unmapped' key
+    pytest.param(
+        dt(2026, 1, 1, 0, 0),
+        dt(2026, 1, 5, 0, 0),
+        [
+            make_changelog_entry("2026-01-01T00:00:00+00:00", "To Do", "UNKNOWN_STATUS"),
+            make_changelog_entry("2026-01-03T00:00:00+00:00", "UNKNOWN_STATUS", "In Progress"),
+        ],
+        {
+            "unmapped": 48.0,  # UNKNOWN_STATUS：2 天
+            "dev": 48.0,       # In Progress → now：2 天
+        },
+        id="unmapped_status",
+    ),
+    # 未解決的 issue 仍應計算已完成階段的時間
+    pytest.param(
+        dt(2026, 1, 1, 0, 0),
+        dt(2026, 1, 5, 0, 0),
+        [
+            make_changelog_entry("2026-01-01T00:00:00+00:00", "To Do", "In Progress"),
+        ],
+        # backlog：0 小時（created 和第一個 change 同時），不列出
+        {"dev": 96.0},  # Jan 1 → now (Jan 5)
+        id="in_progress_issue",
+    ),
+    # 空 changelog 不應崩潰，回傳空 dict
+    pytest.param(
+        dt(2026, 1, 1, 0, 0),
+        dt(2026, 1, 5, 0, 0),
+        [],
+        {},
+        id="empty_changelog",
+    ),
+    # 非 status 欄位的 changelog item 應被忽略
+    pytest.param(
+        dt(2026, 1, 1, 0, 0),
+        dt(2026, 1, 3, 0, 0),
+        [
+            {
+                "created": "2026-01-01T12:00:00+00:00",
+                "items": [
+                    {"field": "assignee", "fromString": None, "toString": "Alice"},
+                    {"field": "status", "fromString": "To Do", "toString": "In Progress"},
+                ],
+            }
+        ],
+        {
+            "backlog": 12.0,  # 0:00 → 12:00
+            "dev": 36.0,      # 12:00 → now
+        },
+        id="non_status_items_ignored",
+    ),
+]
 
-    entries = [
-        make_changelog_entry("2026-01-01T00:00:00+00:00", "To Do", "In Progress"),
-    ]
 
+@pytest.mark.parametrize("created, now, entries, expected", PARSE_CHANGELOG_CASES)
+def test_parse_changelog(created, now, entries, expected):
+    """parse_changelog 應回傳恰好 expected 中的 phase 與停留小時數。"""
     durations = parse_changelog(entries, SIMPLE_LOOKUP, created, now)
 
-    # backlog: 0 小時（created 和第一個 change 同時）
-    # dev: Jan 1 → now (Jan 5) = 96 小時
-    assert abs(durations.get("dev", 0) - 96.0) < 0.01
-
-
-def test_parse_changelog_empty_changelog():
-    """空 changelog 不應崩潰，回傳空 dict。"""
-    created = dt(2026, 1, 1, 0, 0)
-    now = dt(2026, 1, 5, 0, 0)
-
-    durations = parse_changelog([], SIMPLE_LOOKUP, created, now)
-
     assert isinstance(durations, dict)
-    assert len(durations) == 0
-
-
-def test_parse_changelog_non_status_items_ignored():
-    """非 status 欄位的 changelog item 應被忽略。"""
-    created = dt(2026, 1, 1, 0, 0)
-    now = dt(2026, 1, 3, 0, 0)
-
-    entries = [
-        {
-            "created": "2026-01-01T12:00:00+00:00",
-            "items": [
-                {"field": "assignee", "fromString": None, "toString": "Alice"},
-                {"field": "status", "fromString": "To Do", "toString": "In Progress"},
-            ],
-        }
-    ]
-
-    durations = parse_changelog(entries, SIMPLE_LOOKUP, created, now)
-
-    # backlog: 0:00 → 12:00 = 12 小時
-    assert abs(durations.get("backlog", 0) - 12.0) < 0.01
-    # dev: 12:00 → now = 36 小時
-    assert abs(durations.get("dev", 0) - 36.0) < 0.01
+    assert durations == pytest.approx(expected, abs=0.01)
 
 
 # ============================================================
@@ -260,42 +253,36 @@ def test_parse_changelog_non_status_items_ignored():
 # ============================================================
 
 
+@lru_cache(maxsize=None)
+def _parse_iso(ts: str) -> datetime:
+    """解析 ISO 時間字串為 timezone-aware datetime（無時區視為 UTC）。
+
+    各測試重複使用相同的時間字面值，datetime 為不可變物件，快取後同一字串只解析一次。
+    標準 ISO 8601 格式直接以 datetime.fromisoformat 解析，其餘格式才退回 dateutil。
+    """
+    try:
+        parsed = datetime.fromisoformat(ts)
+    except ValueError:
+        parsed = dateutil_parser.parse(ts)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 def make_status_changes(
     *args: tuple[str, str, str],
 ) -> list[tuple]:
     """建立 status_changes：(iso_timestamp, from_status, to_status)。"""
-    from datetime import datetime, timezone
-    result = []
-    for ts, frm, to in args:
-        from dateutil import parser as dateutil_parser
-        parsed = dateutil_parser.parse(ts)
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        result.append((parsed, frm, to))
-    return result
+    return [(_parse_iso(ts), frm, to) for ts, frm, to in args]
 
 
 def test_compute_phase_durations_linear_path():
     """compute_phase_durations：正常線性流程與 parse_changelog 結果一致。"""
-    created = dt(2026, 1, 1, 9, 0)
-    now = dt(2026, 1, 10, 9, 0)
-
-    changes = make_status_changes(
-        ("2026-01-01T10:00:00+00:00", "To Do", "Analysis"),
-        ("2026-01-02T09:00:00+00:00", "Analysis", "In Progress"),
-        ("2026-01-05T09:00:00+00:00", "In Progress", "In Review"),
-        ("2026-01-06T09:00:00+00:00", "In Review", "QA Testing"),
-        ("2026-01-08T09:00:00+00:00", "QA Testing", "Done"),
-    )
+    changes = make_status_changes(*LINEAR_PATH_CHANGES)
 
-    durations = compute_phase_durations(changes, SIMPLE_LOOKUP, created, now)
+    durations = compute_phase_durations(changes, SIMPLE_LOOKUP, LINEAR_PATH_CREATED, LINEAR_PATH_NOW)
 
-    assert abs(durations.get("backlog", 0) - 1.0) < 0.01
-    assert abs(durations.get("planning", 0) - 23.0) < 0.01
-    assert abs(durations.get("dev", 0) - 72.0) < 0.01
-    assert abs(durations.get("review", 0) - 24.0) < 0.01
-    assert abs(durations.get("qa", 0) - 48.0) < 0.01
-    assert abs(durations.get("done", 0) - 48.0) < 0.01
+    assert durations == pytest.approx(LINEAR_PATH_EXPECTED, abs=0.01)
 
 
 def test_compute_phase_durations_empty():
@@ -329,7 +316,7 @@ def test_compute_phase_durations_unmapped_collector():
     # 未對應時間應計入 unmapped
     assert "unmapped" in durations
     # dev: Jan 4 → now (Jan 5) = 24 小時
-    assert abs(durations.get("dev", 0) - 24.0) < 0.01
+    assert durations.get("dev", 0) == pytest.approx(24.0, abs=0.01)
 
 
 def test_compute_phase_durations_unmapped_in_initial_state():
@@ -347,7 +334,7 @@ def test_compute_phase_durations_unmapped_in_initial_state():
     assert "MYSTERY" in collector
     assert "unmapped" in durations
     # 初始 MYSTERY: Jan 1 → Jan 2 = 24 小時
-    assert abs(durations["unmapped"] - 24.0) < 0.01
+    assert durations["unmapped"] == pytest.approx(24.0, abs=0.01)
 
 
 # ============================================================
@@ -372,14 +359,14 @@ def test_remap_with_updated_mapping():
     # 舊 mapping：Evaluate 計 unmapped
     old_durations = compute_phase_durations(changes, SIMPLE_LOOKUP, created, now)
     assert "unmapped" in old_durations
-    assert abs(old_durations["unmapped"] - 48.0) < 0.01
+    assert old_durations["unmapped"] == pytest.approx(48.0, abs=0.01)
 
     # 新 mapping：Evaluate 計 planning
     new_durations = compute_phase_durations(changes, new_lookup, created, now)
     assert "unmapped" not in new_durations
-    assert abs(new_durations.get("planning", 0) - 48.0) < 0.01
+    assert new_durations.get("planning", 0) == pytest.approx(48.0, abs=0.01)
     # dev: Jan 3 → now (Jan 5) = 48 小時
-    assert abs(new_durations.get("dev", 0) - 48.0) < 0.01
+    assert new_durations.get("dev", 0) == pytest.approx(48.0, abs=0.01)
 
 
 def test_backward_compat_no_transitions():